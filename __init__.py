@@ -1,3 +1,11 @@
-from .spawneditor import edit_file, edit_temporary, UnsupportedPlatformError
+from .spawneditor import (edit_file, edit_files, edit_temporary, exec_editor,
+                          refresh_environment, UnsupportedPlatformError)
 
-__all__ = ["edit_file", "edit_temporary", "UnsupportedPlatformError"]
+__all__ = [
+    "edit_file",
+    "edit_files",
+    "edit_temporary",
+    "exec_editor",
+    "refresh_environment",
+    "UnsupportedPlatformError",
+]
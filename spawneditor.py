@@ -25,20 +25,32 @@ A Python module that attempts to provide a common interface for opening an
 editor at a specified line in a file.
 """
 
+import functools
 import os
-import pathlib
-import shlex
-import subprocess
+import re
+import sys
 import tempfile
+import types
 import typing
 
-posix_style = "+{line_number} \"{file_path}\""
-sublime_text_style = "\"{file_path}:{line_number}\""
+# `shlex` and `subprocess` are imported lazily where needed; their
+# transitive imports are a significant fraction of this module's startup
+# cost, which matters for short-lived CLI wrappers.
+
+# Platform properties cannot change within a process, so evaluate them once
+# at import time instead of branching on `os.name` per call.
+_is_posix = (os.name == "posix")
+_has_posix_spawn = hasattr(os, "posix_spawnp")
+
+# Each entry is a tuple of pre-split argument templates so that building the
+# argument list requires no quoting or re-tokenization at invocation time.
+posix_style = ("+{line_number}", "{file_path}")
+sublime_text_style = ("{file_path}:{line_number}",)
 
 # yapf: disable  # See <https://github.com/google/yapf/issues/928>
-editor_syntax_table = {
+_editor_syntax_entries = {
     # Visual Studio Code
-    "code": "--goto \"{file_path}:{line_number}\"",
+    "code": ("--goto", "{file_path}:{line_number}"),
 
     # Sublime Text
     "subl": sublime_text_style,
@@ -48,10 +60,10 @@ editor_syntax_table = {
     "atom": sublime_text_style,
 
     # TextMate
-    "mate": "--line {line_number} \"{file_path}\"",
+    "mate": ("--line", "{line_number}", "{file_path}"),
 
     # Notepad++
-    "notepad++": "-n{line_number} \"{file_path}\"",
+    "notepad++": ("-n{line_number}", "{file_path}"),
 
     # POSIX
     "vi": posix_style,
@@ -64,11 +76,124 @@ editor_syntax_table = {
 }
 # yapf: enable
 
+# Read-only view with interned keys: lookups of interned editor names hit
+# CPython's pointer-equality fast path, and the table cannot be mutated
+# accidentally.
+editor_syntax_table = types.MappingProxyType({
+    sys.intern(editor_name): syntax_formats
+    for (editor_name, syntax_formats) in _editor_syntax_entries.items()
+})
+del _editor_syntax_entries
+
 
 class UnsupportedPlatformError(Exception):
     """An exception class raised for unsupported platforms."""
 
 
+_simple_command_re = re.compile(r"[A-Za-z0-9_\-./ ]+\Z")
+
+
+def _simple_split(command_line: str) -> typing.List[str]:
+    """
+    Splits a command-line string into a list of tokens.
+
+    Equivalent to `shlex.split` but avoids running (and importing) the full
+    `shlex` tokenizer for strings that contain no quoting or escaping, which
+    covers typical `EDITOR`/`VISUAL` values such as `"vim"` or
+    `"code --wait"`.
+    """
+    # The most common case of all is a bare command name: with no whitespace
+    # and no quoting, the string is necessarily a single token.
+    if not any(c in " \t\r\n\"'\\" for c in command_line):
+        return [command_line]
+
+    if _simple_command_re.fullmatch(command_line):
+        return command_line.split()
+
+    import shlex
+    return shlex.split(command_line, posix=_is_posix)
+
+
+@functools.lru_cache(maxsize=None)
+def _default_posix_editor() -> str:
+    """
+    Returns the default editor command for POSIX systems.
+
+    Honors the Debian convention of symlinking `/usr/bin/editor` to the
+    system-wide default editor, falling back to `vi`.  Cached so that
+    repeated calls do not re-stat the symlink chain.
+    """
+    default_editor = "/usr/bin/editor"
+    return (os.path.realpath(default_editor)
+            if os.path.exists(default_editor) else "vi")
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_editor(
+        os_name: str,
+        display: typing.Optional[str],
+        visual: typing.Optional[str],
+        editor: typing.Optional[str],
+) -> typing.Tuple[str, ...]:
+    """
+    Determines the editor command to use from the environment and parses it
+    into a `(editor, *options)` tuple.
+
+    Cached on its arguments (which should be derived from the environment) so
+    that callers invoking `edit_file` in a loop do not repeatedly stat
+    `/usr/bin/editor` or re-parse the same command string.
+
+    Raises an `UnsupportedPlatformError` if an editor cannot be determined.
+    """
+    editor = (display and visual) or editor
+
+    if not editor:
+        if os_name == "posix":
+            editor = _default_posix_editor()
+        elif os_name == "nt":
+            editor = "notepad.exe"
+        else:
+            raise UnsupportedPlatformError(
+                "Unable to determine what text editor to use.  "
+                "Set the EDITOR environment variable.")
+
+    return tuple(_simple_split(editor))
+
+
+def _spawn_and_wait(command: typing.Sequence[str],
+                    stdin: typing.Optional[typing.TextIO] = None) -> None:
+    """
+    Runs the specified command and waits for it to complete.
+
+    Where available, uses `os.posix_spawnp`, which avoids the overhead of
+    `fork`ing the (potentially large) calling process that
+    `subprocess.run` can incur.  Falls back to `subprocess.run` on other
+    platforms.
+
+    `stdin` may be specified to redirect the spawned process's standard input
+    stream.
+
+    Raises `subprocess.CalledProcessError` if the command exits with a
+    non-zero exit code.
+    """
+    import subprocess
+    if _has_posix_spawn:
+        file_actions = []
+        if stdin is not None:
+            file_actions.append((os.POSIX_SPAWN_DUP2, stdin.fileno(), 0))
+        pid = os.posix_spawnp(command[0], command, os.environ,
+                              file_actions=file_actions)
+        (_, status) = os.waitpid(pid, 0)
+        if os.WIFSIGNALED(status):
+            exit_code = -os.WTERMSIG(status)
+        else:
+            exit_code = os.WEXITSTATUS(status)
+        if exit_code != 0:
+            raise subprocess.CalledProcessError(exit_code, list(command))
+    else:
+        subprocess.run(command, stdin=stdin, check=True)
+
+
 def edit_file(file_path: typing.Optional[str],
               *,
               line_number: typing.Optional[int] = None,
@@ -87,6 +212,9 @@ def edit_file(file_path: typing.Optional[str],
     3. The `EDITOR` environment variable.
     4. Hard-coded paths to common editors.
 
+    The environment variables are snapshotted when `spawneditor` is imported;
+    see `refresh_environment`.
+
     `stdin` may be specified to override a redirected standard input stream
     with a TTY.
 
@@ -94,52 +222,139 @@ def edit_file(file_path: typing.Optional[str],
 
     Raises `subprocess.CalledProcessError` if opening the editor failed.
     """
-    options: typing.List[str] = []
-    additional_arguments: typing.List[str] = []
+    _spawn_and_wait(_editor_command(file_path, line_number, editor),
+                    stdin=stdin)
 
-    editor = (editor
-              or (os.environ.get("DISPLAY") and os.environ.get("VISUAL"))
-              or os.environ.get("EDITOR"))
 
-    if not editor:
-        if os.name == "posix":
-            default_editor = pathlib.Path("/usr/bin/editor")
-            editor = (str(default_editor.resolve())
-                      if default_editor.exists() else "vi")
-        elif os.name == "nt":
-            editor = "notepad.exe"
-            line_number = None
-        else:
-            raise UnsupportedPlatformError(
-                "Unable to determine what text editor to use.  "
-                "Set the EDITOR environment variable.")
+def exec_editor(file_path: typing.Optional[str],
+                *,
+                line_number: typing.Optional[int] = None,
+                editor: typing.Optional[str] = None) -> "typing.NoReturn":
+    """
+    Like `edit_file`, but replaces the current process with the editor
+    instead of spawning a child process and waiting for it.
+
+    Intended for wrapper scripts that exit as soon as the editor does anyway;
+    `exec`ing saves spawning a child process and keeping the parent resident.
+    On platforms without a true `exec`, runs the editor in a child process and
+    exits with its exit code.
+
+    Does not return.
+
+    Raises an `UnsupportedPlatformError` if an editor cannot be determined.
+    """
+    command = _editor_command(file_path, line_number, editor)
+    if _is_posix:
+        os.execvp(command[0], command)
+    else:
+        import subprocess
+        try:
+            _spawn_and_wait(command)
+        except subprocess.CalledProcessError as e:
+            sys.exit(e.returncode)
+        sys.exit(0)
+
+
+def refresh_environment() -> None:
+    """
+    Re-reads the environment variables used to choose the default editor.
+
+    The `DISPLAY`, `VISUAL`, and `EDITOR` environment variables are
+    snapshotted when `spawneditor` is imported so that repeated calls avoid
+    `os.environ` lookups.  Long-running programs that modify `os.environ`
+    afterwards should call this function to pick up the changes.
+    """
+    global _environment_snapshot
+    _environment_snapshot = (os.environ.get("DISPLAY"),
+                             os.environ.get("VISUAL"),
+                             os.environ.get("EDITOR"))
 
-    assert editor
-    (editor, *options) = shlex.split(editor, posix=(os.name == "posix"))
-
-    if file_path:
-        if file_path.startswith("-"):
-            # Ensure that files that start with a hyphen aren't treated as
-            # options.  The invoked editor might not follow the POSIX practice
-            # of using a special `--` option, so tweaking the file path is more
-            # universal.
-            #
-            # Use `os.path.join` instead of `pathlib.Path` because the latter
-            # automatically normalizes, which we do NOT want in this case.
-            file_path = os.path.join(".", file_path)
-
-        additional_arguments = [file_path]
-        if line_number:
-            editor_name = pathlib.Path(editor).stem
-            syntax_format = editor_syntax_table.get(editor_name)
-            if syntax_format:
-                additional_arguments = shlex.split(
-                    syntax_format.format(file_path=file_path,
-                                         line_number=line_number))
-
-    subprocess.run((editor, *options, *additional_arguments),
-                   stdin=stdin,
-                   check=True)
+
+refresh_environment()
+
+
+def _parse_editor(
+        editor: typing.Optional[str]) -> typing.Tuple[str, ...]:
+    """
+    Parses the specified editor command into a `(editor, *options)` tuple,
+    falling back to the environment if no editor is specified.
+
+    Raises an `UnsupportedPlatformError` if an editor cannot be determined.
+    """
+    if editor:
+        return tuple(_simple_split(editor))
+    return _resolve_editor(os.name, *_environment_snapshot)
+
+
+def _file_arguments(
+        editor: str,
+        file_path: typing.Optional[str],
+        line_number: typing.Optional[int]) -> typing.Tuple[str, ...]:
+    """
+    Builds the file-specific arguments for the specified editor, using the
+    line-number syntax for recognized editors.
+    """
+    if not file_path:
+        return ()
+
+    if file_path.startswith("-"):
+        # Ensure that files that start with a hyphen aren't treated as
+        # options.  The invoked editor might not follow the POSIX practice
+        # of using a special `--` option, so tweaking the file path is more
+        # universal.
+        #
+        # Use `os.path.join` instead of `pathlib.Path` because the latter
+        # automatically normalizes, which we do NOT want in this case.
+        file_path = os.path.join(".", file_path)
+
+    if line_number:
+        editor_name = sys.intern(
+            os.path.splitext(os.path.basename(editor))[0])
+        syntax_formats = editor_syntax_table.get(editor_name)
+        if syntax_formats:
+            return tuple(
+                syntax_format.format(file_path=file_path,
+                                     line_number=line_number)
+                for syntax_format in syntax_formats)
+
+    return (file_path,)
+
+
+def _editor_command(
+        file_path: typing.Optional[str],
+        line_number: typing.Optional[int],
+        editor: typing.Optional[str],
+) -> typing.Tuple[str, ...]:
+    """
+    Determines the editor to use and builds the complete command to open the
+    specified file.
+
+    Raises an `UnsupportedPlatformError` if an editor cannot be determined.
+    """
+    command = _parse_editor(editor)
+    return command + _file_arguments(command[0], file_path, line_number)
+
+
+def edit_files(file_paths: typing.Iterable[str],
+               *,
+               editor: typing.Optional[str] = None,
+               stdin: typing.Optional[typing.TextIO] = None) -> None:
+    """
+    Opens each of the specified files in an editor, one file at a time.
+
+    Equivalent to calling `edit_file` on each path in turn, except that the
+    editor command is determined and parsed only once for the whole batch.
+
+    For all parameters, see `edit_file`.
+
+    Raises an `UnsupportedPlatformError` if an editor cannot be determined.
+
+    Raises `subprocess.CalledProcessError` if opening the editor failed.
+    """
+    command = _parse_editor(editor)
+    for file_path in file_paths:
+        _spawn_and_wait(command + _file_arguments(command[0], file_path, None),
+                        stdin=stdin)
 
 
 def edit_temporary(
@@ -188,3 +403,55 @@ def edit_temporary(
                 os.remove(file.name)
             except FileNotFoundError:
                 pass
+
+
+def _main(argv: typing.List[str]) -> int:
+    """
+    Entry point for `python -m spawneditor [--line LINE] [FILE]`.
+
+    Runs the default editor on the specified file at the specified line
+    number.  Also backs `example/editor.py` so that there is a single
+    option parser to maintain.
+    """
+    line_number: typing.Optional[int] = None
+    file_path: typing.Optional[str] = None
+
+    arguments = argv[1:]
+    i = 0
+    while i < len(arguments):
+        argument = arguments[i]
+        if argument in ("-h", "--help"):
+            print(f"Usage: {argv[0]} [--line LINE] [FILE]")
+            return 0
+        elif argument == "--line" or argument.startswith("--line="):
+            if argument == "--line":
+                i += 1
+                value = arguments[i] if i < len(arguments) else ""
+            else:
+                value = argument[len("--line="):]
+            try:
+                line_number = int(value)
+            except ValueError:
+                print(f"{argv[0]}: Invalid line number: {value}",
+                      file=sys.stderr)
+                return 1
+        elif argument.startswith("-") and argument != "-":
+            print(f"{argv[0]}: Unrecognized option: {argument}",
+                  file=sys.stderr)
+            return 1
+        elif file_path is None:
+            file_path = argument
+        else:
+            print(f"{argv[0]}: Unexpected argument: {argument}",
+                  file=sys.stderr)
+            return 1
+        i += 1
+
+    exec_editor(file_path, line_number=line_number)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(_main(sys.argv))
+    except KeyboardInterrupt:
+        sys.exit(1)
@@ -0,0 +1,198 @@
+# spawneditor_daemon.py
+#
+# Copyright (C) 2020-2022 James D. Lin <jamesdlin@berkeley.edu>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+An optional daemon mode for `spawneditor`.
+
+Programs that spawn editors at high frequency (e.g. hook scripts or review
+tools) pay full Python interpreter startup on every invocation.  Running
+
+    python spawneditor_daemon.py
+
+starts a daemon that listens on a Unix domain socket and spawns editors on
+behalf of clients; `edit_file_via_daemon` then turns each invocation into a
+small socket round-trip.  If no daemon is listening, `edit_file_via_daemon`
+transparently falls back to an in-process `spawneditor.edit_file` call.
+"""
+
+import json
+import os
+import socket
+import sys
+import typing
+
+import spawneditor
+
+
+def default_socket_path() -> typing.Optional[str]:
+    """
+    Returns the default path to the daemon's Unix domain socket
+    (`$XDG_RUNTIME_DIR/spawneditor.sock`), or `None` if `XDG_RUNTIME_DIR`
+    is not set.
+
+    The shared system temporary directory is deliberately not used as a
+    fallback: a well-known socket name there could be pre-created (or a
+    rogue daemon bound to it) by any other local user.  `XDG_RUNTIME_DIR`
+    is per-user and inaccessible to other users.
+    """
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_directory:
+        return None
+    return os.path.join(runtime_directory, "spawneditor.sock")
+
+
+def _handle_request(
+        request: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """
+    Executes a single decoded daemon request by dispatching to
+    `spawneditor.edit_file` and returns the response to send to the client.
+    """
+    import subprocess
+    try:
+        spawneditor.edit_file(request.get("file"),
+                              line_number=request.get("line"),
+                              editor=request.get("editor"))
+    except subprocess.CalledProcessError as e:
+        return {"returncode": e.returncode, "command": e.cmd}
+    except Exception as e:  # pylint: disable=broad-except
+        return {"error": str(e)}
+    return {"returncode": 0}
+
+
+def _serve_connection(connection: socket.socket) -> None:
+    """
+    Reads a single JSON request from the specified connection, executes it,
+    and writes back a JSON response.
+    """
+    with connection.makefile("r", encoding="utf-8") as reader:
+        data = reader.read()
+
+    try:
+        request = json.loads(data)
+    except ValueError as e:
+        response: typing.Dict[str, typing.Any] = {"error": str(e)}
+    else:
+        response = _handle_request(request)
+
+    connection.sendall(json.dumps(response).encode("utf-8"))
+
+
+def serve(socket_path: typing.Optional[str] = None) -> None:
+    """
+    Runs the daemon, serving requests one at a time until killed.
+
+    `socket_path` specifies the path to the Unix domain socket to listen on
+    (see `default_socket_path`).
+
+    Raises `ValueError` if no socket path is specified and
+    `XDG_RUNTIME_DIR` is not set.
+    """
+    socket_path = socket_path or default_socket_path()
+    if not socket_path:
+        raise ValueError("No socket path specified, and XDG_RUNTIME_DIR is "
+                         "not set.")
+    try:
+        os.remove(socket_path)
+    except FileNotFoundError:
+        pass
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        while True:
+            (connection, _) = server.accept()
+            with connection:
+                # A misbehaving client (e.g. a hook script killed before
+                # reading the response, or one sending non-UTF-8 bytes)
+                # must not take the daemon down with it.
+                try:
+                    _serve_connection(connection)
+                except (OSError, UnicodeDecodeError):
+                    pass
+
+
+def edit_file_via_daemon(file_path: typing.Optional[str],
+                         *,
+                         line_number: typing.Optional[int] = None,
+                         editor: typing.Optional[str] = None,
+                         socket_path: typing.Optional[str] = None) -> None:
+    """
+    Asks a running `spawneditor` daemon to open the specified file in an
+    editor, waiting until the editor exits.
+
+    If no daemon is listening (or if the platform has no Unix domain
+    sockets, or if no socket path is available), falls back to calling
+    `spawneditor.edit_file` in-process.
+
+    `socket_path` specifies the path to the daemon's Unix domain socket (see
+    `default_socket_path`).  For all other parameters, see
+    `spawneditor.edit_file`.
+
+    Raises `subprocess.CalledProcessError` if opening the editor failed.
+    """
+    data: typing.Optional[bytes] = None
+    socket_path = socket_path or default_socket_path()
+    if socket_path and hasattr(socket, "AF_UNIX"):
+        request = {"file": file_path, "line": line_number, "editor": editor}
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+                client.sendall(json.dumps(request).encode("utf-8"))
+                client.shutdown(socket.SHUT_WR)
+                chunks = []
+                while True:
+                    chunk = client.recv(4096)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+        except OSError:
+            data = None
+
+    # An empty or truncated response means the daemon died after accepting
+    # but before (or while) replying; treat it the same as a failure to
+    # connect.
+    try:
+        response = json.loads(data) if data else None
+    except ValueError:
+        response = None
+
+    if response is None:
+        spawneditor.edit_file(file_path,
+                              line_number=line_number,
+                              editor=editor)
+        return
+
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    if response.get("returncode"):
+        import subprocess
+        raise subprocess.CalledProcessError(response["returncode"],
+                                            response.get("command") or [])
+
+
+if __name__ == "__main__":
+    try:
+        serve(sys.argv[1] if len(sys.argv) > 1 else None)
+    except KeyboardInterrupt:
+        sys.exit(1)
@@ -0,0 +1,252 @@
+"""Shared test helpers for the spawneditor unit tests."""
+
+import io
+import itertools
+import os
+import typing
+import unittest.mock
+
+import pytest
+
+import spawneditor
+
+
+# The path whose existence `fake_path_exists` denies.  spawneditor only ever
+# probes this exact absolute path, so no normalization is needed.
+_hidden_editor_path = "/usr/bin/editor"
+
+
+def fake_path_exists(path: str) -> bool:
+    """
+    Fake version of `os.path.exists` that ignores the existence of
+    `/usr/bin/editor` so that tests behave the same on all systems.
+    """
+    return path != _hidden_editor_path
+
+
+class SpawnRecorder:
+    """
+    A lightweight stand-in for `spawneditor._spawn_and_wait` that records
+    the arguments of each call.  (A plain callable avoids the attribute
+    interception overhead of `unittest.mock.MagicMock`.)
+    """
+    def __init__(self) -> None:
+        self.calls: typing.List[typing.Tuple[typing.Tuple[typing.Any, ...],
+                                             typing.Dict[str,
+                                                         typing.Any]]] = []
+
+    def __call__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.calls.append((args, kwargs))
+
+
+@pytest.fixture(autouse=True)
+def restore_environment_snapshot() -> typing.Iterator[None]:
+    """
+    Re-snapshots the real environment after each test.  Tests call
+    `refresh_environment` while `os.environ` is monkeypatched, which would
+    otherwise leave `spawneditor`'s snapshot pointing at a fake dict for
+    the rest of the session.
+
+    (Autouse fixtures are set up before a test's requested fixtures, so
+    this teardown runs after `monkeypatch` has restored `os.environ`.)
+    """
+    yield
+    spawneditor.refresh_environment()
+
+
+@pytest.fixture
+def spawn_mock(monkeypatch: pytest.MonkeyPatch) -> SpawnRecorder:
+    """
+    Patches everything that is invariant across `edit_file` tests -- the
+    platform name, `/usr/bin/editor` probing, and the spawn call itself --
+    once per test, and returns the recording spawn function.
+
+    (A session-scoped patch would be unsafe: `fake_path_exists` must not
+    leak into tests that touch the real filesystem.)
+    """
+    recorder = SpawnRecorder()
+    monkeypatch.setattr(os, "name", "posix")
+    monkeypatch.setattr(os.path, "exists", fake_path_exists)
+    monkeypatch.setattr(spawneditor, "_spawn_and_wait", recorder)
+    return recorder
+
+
+def expect_edit_file(monkeypatch: pytest.MonkeyPatch,
+                     spawn_mock: SpawnRecorder,
+                     file_path: str,
+                     *,
+                     line_number: typing.Optional[int],
+                     environment: typing.Dict[str, str],
+                     expected_command: typing.Iterable[str],
+                     editor: typing.Optional[str] = None) -> None:
+    """
+    Verifies the behavior of `spawneditor.edit_file`.  The caller supplies
+    the `spawn_mock` fixture; only the per-call environment is installed
+    here.
+    """
+    # Normalize to a tuple up front so that the comparison below cannot be
+    # tripped up by (or exhaust) a generator argument.
+    expected_command = tuple(expected_command)
+
+    # The default-editor caches must be cleared so that results computed
+    # outside of (or under different) mocks don't leak between tests.
+    spawneditor._default_posix_editor.cache_clear()
+    spawneditor._resolve_editor.cache_clear()
+
+    spawn_mock.calls.clear()
+    monkeypatch.setattr(os, "environ", environment)
+
+    spawneditor.refresh_environment()
+    spawneditor.edit_file(file_path, line_number=line_number, editor=editor)
+    assert spawn_mock.calls == [((expected_command,), {"stdin": None})]
+
+
+# The predetermined contents that the fake editor "writes" to the edited
+# temporary file.  The list form is what `edit_temporary` is expected to
+# return; the pre-joined blob is what the fake writes in a single call.
+output_lines = [
+    "Lorem ipsum dolor sit amet,\n",
+    "consectetur adipiscing elit.\n",
+    "Cras dictum libero magna,\n",
+    "at aliquet quam accumsan ultricies.\n",
+    "Vestibulum efficitur eu.",  # Newline intentionally omitted.
+]
+output_blob = "".join(output_lines)
+
+
+class FakeNamedTemporaryFile:
+    """
+    An in-memory stand-in for `tempfile.NamedTemporaryFile` so that
+    `edit_temporary` tests perform no filesystem I/O.
+    """
+    _counter = itertools.count()
+
+    def __init__(self,
+                 mode: str = "w",
+                 *,
+                 prefix: typing.Optional[str] = None,
+                 delete: bool = True,
+                 encoding: typing.Optional[str] = None) -> None:
+        del mode, delete, encoding  # Unused.
+        self.name = os.path.join("/fake-temporary-directory",
+                                 f"{prefix or 'tmp'}{next(self._counter)}")
+        self.buffer = io.StringIO()
+        self.closed = False
+
+    def write(self, s: str) -> int:
+        """Writes to the in-memory buffer."""
+        return self.buffer.write(s)
+
+    def close(self) -> None:
+        """Marks the file as closed, preserving the buffer contents."""
+        self.closed = True
+
+    def __enter__(self) -> "FakeNamedTemporaryFile":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+def expect_edit_temporary(
+        *,
+        content_lines: typing.Optional[typing.Iterable[str]] = None,
+        temporary_prefix: typing.Optional[str] = None,
+        line_number: typing.Optional[int] = None,
+        editor: typing.Optional[str] = None,
+        stdin: typing.Optional[typing.TextIO] = None) -> None:
+    """
+    Verifies the behavior of `spawn_editor.edit_tempoary`, setting up necessary
+    mocks.
+    """
+    temp_file: typing.Optional[FakeNamedTemporaryFile] = None
+    removed_paths: typing.List[str] = []
+    real_open = open
+
+    # Materialize `content_lines` once so that a generator argument cannot be
+    # exhausted before `edit_temporary` sees it, and precompute the expected
+    # initial file contents instead of re-joining per mock invocation.
+    content_lines = (tuple(content_lines)
+                     if content_lines is not None else None)
+    expected_initial_content = ("\n".join(itertools.chain(content_lines,
+                                                          [""]))
+                                if content_lines else "")
+
+    expected_line_number = line_number
+    expected_editor = editor
+    expected_stdin = stdin
+
+    def temp_file_wrapper(*args: typing.Any,
+                          **kwargs: typing.Any) -> FakeNamedTemporaryFile:
+        """
+        A `tempfile.NamedTemporaryFile` replacement that returns (and
+        captures) a `FakeNamedTemporaryFile`.
+        """
+        nonlocal temp_file
+        temp_file = FakeNamedTemporaryFile(*args, **kwargs)
+        return temp_file
+
+    def fake_open(file_path: str,
+                  mode: str = "r",
+                  **kwargs: typing.Any) -> typing.IO[str]:
+        """
+        Fake version of `open` that serves the fake temporary file's contents
+        from memory.
+        """
+        assert temp_file is not None
+        if file_path == temp_file.name:
+            assert mode == "r"
+            return io.StringIO(temp_file.buffer.getvalue())
+        return typing.cast(typing.IO[str],
+                           real_open(file_path, mode, **kwargs))
+
+    def fake_remove(file_path: str) -> None:
+        """Fake version of `os.remove` that records the removed path."""
+        removed_paths.append(file_path)
+
+    def fake_edit_file(file_path: str,
+                       *,
+                       line_number: typing.Optional[int] = None,
+                       editor: typing.Optional[str] = None,
+                       stdin: typing.Optional[typing.TextIO] = None) -> None:
+        """
+        Fake version of `spawneditor.edit_file` that verifies that it was
+        called with the expected arguments, that the edited file has the
+        expected content, and that writes predetermined output to the edited
+        file.
+        """
+        if temporary_prefix is not None:
+            assert os.path.basename(file_path).startswith(temporary_prefix)
+        assert temp_file is not None
+        assert file_path == temp_file.name
+        assert line_number == expected_line_number
+        assert editor == expected_editor
+        assert stdin == expected_stdin
+
+        # Verify the initial file contents.
+        assert temp_file.closed
+        assert temp_file.buffer.getvalue() == expected_initial_content
+
+        # Simulate the user editing the file.
+        temp_file.buffer = io.StringIO(output_blob)
+
+    with unittest.mock.patch("tempfile.NamedTemporaryFile",
+                             temp_file_wrapper), \
+         unittest.mock.patch("builtins.open", fake_open), \
+         unittest.mock.patch("os.remove", fake_remove), \
+         unittest.mock.patch("spawneditor.edit_file",
+                             side_effect=fake_edit_file,
+                             autospec=True) as mock_edit:
+
+        mock_manager = unittest.mock.Mock()
+        mock_manager.attach_mock(mock_edit, "edit_file")
+
+        lines = spawneditor.edit_temporary(content_lines,
+                                           temporary_prefix=temporary_prefix,
+                                           line_number=line_number,
+                                           editor=editor)
+        mock_manager.edit_file.assert_called_once()
+        assert temp_file is not None
+        assert temp_file.closed
+        assert removed_paths == [temp_file.name]
+        assert lines == output_lines
@@ -0,0 +1 @@
+../spawneditor_daemon.py
\ No newline at end of file
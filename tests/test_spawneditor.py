@@ -0,0 +1,418 @@
+"""Unit tests for spawneditor."""
+
+import json
+import os
+import pathlib
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import typing
+import unittest.mock
+
+import pytest
+
+import spawneditor
+import spawneditor_daemon
+
+from conftest import (SpawnRecorder, expect_edit_file,
+                      expect_edit_temporary)
+
+
+def test_basic_without_line(monkeypatch: pytest.MonkeyPatch,
+                            spawn_mock: SpawnRecorder) -> None:
+    """Tests basic usage without a line number."""
+    editor = "vi"
+    file_path = "some_file.txt"
+    expect_edit_file(monkeypatch,
+                     spawn_mock,
+                     file_path,
+                     line_number=None,
+                     environment={"EDITOR": editor},
+                     expected_command=(editor, file_path))
+
+
+def test_basic_with_line(monkeypatch: pytest.MonkeyPatch,
+                         spawn_mock: SpawnRecorder) -> None:
+    """Tests basic usage with a line number."""
+    editor = "vi"
+    file_path = "some_file.txt"
+    line_number = 42
+    expect_edit_file(monkeypatch,
+                     spawn_mock,
+                     file_path,
+                     line_number=line_number,
+                     environment={"EDITOR": editor},
+                     expected_command=(editor, f"+{line_number}", file_path))
+
+
+def test_unrecognized_editor_with_line(
+        monkeypatch: pytest.MonkeyPatch,
+        spawn_mock: SpawnRecorder) -> None:
+    """Tests that line numbers are ignored for unrecognized editors."""
+    editor = "some_unrecognized_editor"
+    file_path = "some_file.txt"
+    line_number = 42
+    expect_edit_file(monkeypatch,
+                     spawn_mock,
+                     file_path,
+                     line_number=line_number,
+                     environment={"EDITOR": editor},
+                     expected_command=(editor, file_path))
+
+
+def test_arguments(monkeypatch: pytest.MonkeyPatch,
+                   spawn_mock: SpawnRecorder) -> None:
+    """Tests that a full path and arguments to the editor are preserved."""
+    editor = "/some/path with spaces/vi"
+    file_path = "some_file.txt"
+    line_number: typing.Optional[int] = None
+    expect_edit_file(
+        monkeypatch,
+        spawn_mock,
+        file_path,
+        line_number=line_number,
+        environment={"EDITOR": f"\"{editor}\" --one -2 three"},
+        expected_command=(editor, "--one", "-2", "three", file_path))
+
+    line_number = 42
+    expect_edit_file(
+        monkeypatch,
+        spawn_mock,
+        file_path,
+        line_number=line_number,
+        environment={"EDITOR": f"\"{editor}\" --one -2 three"},
+        expected_command=(editor,
+                          "--one",
+                          "-2",
+                          "three",
+                          f"+{line_number}",
+                          file_path))
+
+
+def test_hyphen_prefix(monkeypatch: pytest.MonkeyPatch,
+                       spawn_mock: SpawnRecorder) -> None:
+    """
+    Tests that file paths are tweaked to prevent file paths from starting
+    with a hyphen.
+    """
+    editor = "vi"
+    file_path = "-some_file.txt"
+    line_number: typing.Optional[int] = None
+    expect_edit_file(monkeypatch,
+                     spawn_mock,
+                     file_path,
+                     line_number=line_number,
+                     environment={"EDITOR": editor},
+                     expected_command=(editor, f"./{file_path}"))
+
+    line_number = 42
+    expect_edit_file(monkeypatch,
+                     spawn_mock,
+                     file_path,
+                     line_number=line_number,
+                     environment={"EDITOR": editor},
+                     expected_command=(editor,
+                                       f"+{line_number}",
+                                       f"./{file_path}"))
+
+
+def test_editor_identification(
+        monkeypatch: pytest.MonkeyPatch,
+        spawn_mock: SpawnRecorder) -> None:
+    """
+    Tests that file extensions and directories are ignored when identifying
+    editors.
+    """
+    editor = "C:/Program Files/Sublime Text/subl.exe"
+    file_path = "some_file.txt"
+    line_number = 42
+    expect_edit_file(monkeypatch,
+                     spawn_mock,
+                     file_path,
+                     line_number=line_number,
+                     environment={"EDITOR": f"\"{editor}\" --wait"},
+                     expected_command=(editor,
+                                       "--wait",
+                                       f"{file_path}:{line_number}"))
+
+
+# The editor-precedence scenarios, with the expected commands built once at
+# module scope instead of per test invocation.  Each entry is
+# `(environment, explicit_editor, expected_command)`.
+_precedence_cases = (
+    ({}, None, ("vi", "+42", "some_file.txt")),
+    ({"EDITOR": "some_editor"}, None, ("some_editor", "some_file.txt")),
+    ({"EDITOR": "some_editor", "VISUAL": "some_visual_editor"},
+     None,
+     ("some_editor", "some_file.txt")),
+    ({"EDITOR": "some_editor",
+      "VISUAL": "some_visual_editor",
+      "DISPLAY": ":0.0"},
+     None,
+     ("some_visual_editor", "some_file.txt")),
+    ({"EDITOR": "some_editor",
+      "VISUAL": "some_visual_editor",
+      "DISPLAY": ":0.0"},
+     "explicit_editor",
+     ("explicit_editor", "some_file.txt")),
+)
+
+
+@pytest.mark.parametrize("environment, explicit_editor, expected_command",
+                         _precedence_cases)
+def test_precedence(monkeypatch: pytest.MonkeyPatch,
+                    spawn_mock: SpawnRecorder,
+                    environment: typing.Dict[str, str],
+                    explicit_editor: typing.Optional[str],
+                    expected_command: typing.Tuple[str, ...]) -> None:
+    """Tests that the editor is chosen in the expected order."""
+    # Copy the parametrized environment so that cases stay independent and
+    # can run in any order.
+    expect_edit_file(monkeypatch,
+                     spawn_mock,
+                     "some_file.txt",
+                     line_number=42,
+                     environment=dict(environment),
+                     expected_command=expected_command,
+                     editor=explicit_editor)
+
+
+def test_edit_files(monkeypatch: pytest.MonkeyPatch,
+                    spawn_mock: SpawnRecorder) -> None:
+    """Tests that `edit_files` opens each file with the same editor command."""
+    editor = "vi"
+    file_paths = ["some_file.txt", "another_file.txt"]
+    spawneditor._resolve_editor.cache_clear()
+
+    monkeypatch.setattr(os, "environ", {"EDITOR": editor})
+
+    spawneditor.refresh_environment()
+    spawneditor.edit_files(file_paths)
+    assert spawn_mock.calls == [(((editor, file_path),), {"stdin": None})
+                                for file_path in file_paths]
+
+
+def test_exec_editor(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that `exec_editor` replaces the current process with the editor."""
+    editor = "vi"
+    file_path = "some_file.txt"
+    line_number = 42
+    spawneditor._resolve_editor.cache_clear()
+
+    mock_execvp = unittest.mock.MagicMock()
+    monkeypatch.setattr(os, "environ", {"EDITOR": editor})
+    monkeypatch.setattr(os, "name", "posix")
+    monkeypatch.setattr(os, "execvp", mock_execvp)
+
+    spawneditor.refresh_environment()
+    spawneditor.exec_editor(file_path, line_number=line_number)
+    mock_execvp.assert_called_once_with(editor,
+                                        (editor, f"+{line_number}", file_path))
+
+
+def test_spawn_and_wait_success() -> None:
+    """Tests that `_spawn_and_wait` runs a real command to completion."""
+    spawneditor._spawn_and_wait((sys.executable, "-c", "pass"))
+
+
+def test_spawn_and_wait_nonzero_exit() -> None:
+    """Tests that a non-zero exit code raises `CalledProcessError`."""
+    command = (sys.executable, "-c", "raise SystemExit(3)")
+    with pytest.raises(subprocess.CalledProcessError) as exception_info:
+        spawneditor._spawn_and_wait(command)
+    assert exception_info.value.returncode == 3
+    assert exception_info.value.cmd == list(command)
+
+
+def test_spawn_and_wait_death_by_signal() -> None:
+    """Tests that death by signal is reported as a negative return code."""
+    command = (sys.executable,
+               "-c",
+               "import os, signal; os.kill(os.getpid(), signal.SIGKILL)")
+    with pytest.raises(subprocess.CalledProcessError) as exception_info:
+        spawneditor._spawn_and_wait(command)
+    assert exception_info.value.returncode == -signal.SIGKILL
+
+
+def test_spawn_and_wait_stdin_redirection(tmp_path: pathlib.Path) -> None:
+    """Tests that `stdin` redirects the spawned process's standard input."""
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("expected input\n")
+    command = (sys.executable,
+               "-c",
+               "import sys; "
+               "raise SystemExit(0 if sys.stdin.read() == 'expected input\\n'"
+               " else 1)")
+    with open(input_path, "r", encoding="utf-8") as stdin:
+        spawneditor._spawn_and_wait(command, stdin=stdin)
+
+
+def test_edit_temporary_basic() -> None:
+    """Tests basic `edit_temporary` usage with default arguments."""
+    expect_edit_temporary()
+
+
+def test_edit_temporary_with_content() -> None:
+    """Tests `edit_temporary` usage with initial instructions."""
+    instructions = ["Do some stuff below the line.", "---"]
+    expect_edit_temporary(content_lines=instructions,
+                          line_number=len(instructions) + 1)
+
+
+def test_daemon_round_trip() -> None:
+    """Tests that a daemon request is dispatched to `edit_file`."""
+    with unittest.mock.patch("spawneditor.edit_file") as mock_edit:
+        (server, client) = socket.socketpair()
+        with server, client:
+            client.sendall(
+                json.dumps({
+                    "file": "some_file.txt",
+                    "line": 42,
+                }).encode("utf-8"))
+            client.shutdown(socket.SHUT_WR)
+            spawneditor_daemon._serve_connection(server)
+            response = json.loads(client.recv(4096))
+        mock_edit.assert_called_once_with("some_file.txt",
+                                          line_number=42,
+                                          editor=None)
+        assert response == {"returncode": 0}
+
+
+def test_daemon_survives_abrupt_disconnect() -> None:
+    """
+    Tests that a client that disconnects without reading the response does
+    not kill the daemon's accept loop.
+    """
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        socket_path = os.path.join(temporary_directory, "spawneditor.sock")
+        with unittest.mock.patch("spawneditor.edit_file"):
+            thread = threading.Thread(target=spawneditor_daemon.serve,
+                                      args=(socket_path,),
+                                      daemon=True)
+            thread.start()
+            for _ in range(1000):
+                if os.path.exists(socket_path):
+                    break
+                time.sleep(0.001)
+
+            # Send a request and disconnect without reading the response.
+            with socket.socket(socket.AF_UNIX,
+                               socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+                client.sendall(json.dumps({"file": "some_file.txt"})
+                               .encode("utf-8"))
+                client.shutdown(socket.SHUT_WR)
+
+            # The daemon must still serve a subsequent well-behaved client.
+            with socket.socket(socket.AF_UNIX,
+                               socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+                client.sendall(json.dumps({"file": "some_file.txt"})
+                               .encode("utf-8"))
+                client.shutdown(socket.SHUT_WR)
+                chunks = []
+                while True:
+                    chunk = client.recv(4096)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            assert json.loads(b"".join(chunks)) == {"returncode": 0}
+
+
+def test_daemon_fallback_on_empty_response() -> None:
+    """
+    Tests the in-process fallback when the daemon dies after accepting a
+    connection but before replying.
+    """
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        socket_path = os.path.join(temporary_directory, "spawneditor.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen()
+
+            def accept_and_close() -> None:
+                (connection, _) = server.accept()
+                connection.close()
+
+            thread = threading.Thread(target=accept_and_close, daemon=True)
+            thread.start()
+
+            with unittest.mock.patch("spawneditor.edit_file") as mock_edit:
+                spawneditor_daemon.edit_file_via_daemon(
+                    "some_file.txt",
+                    line_number=42,
+                    socket_path=socket_path)
+                mock_edit.assert_called_once_with("some_file.txt",
+                                                  line_number=42,
+                                                  editor=None)
+            thread.join()
+
+
+def test_daemon_fallback_without_daemon() -> None:
+    """Tests the in-process fallback when no daemon is listening."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        socket_path = os.path.join(temporary_directory, "spawneditor.sock")
+        with unittest.mock.patch("spawneditor.edit_file") as mock_edit:
+            spawneditor_daemon.edit_file_via_daemon("some_file.txt",
+                                                    line_number=42,
+                                                    socket_path=socket_path)
+            mock_edit.assert_called_once_with("some_file.txt",
+                                              line_number=42,
+                                              editor=None)
+
+
+def test_daemon_fallback_on_truncated_response() -> None:
+    """
+    Tests the in-process fallback when the daemon dies partway through
+    writing its response.
+    """
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        socket_path = os.path.join(temporary_directory, "spawneditor.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen()
+
+            def accept_and_truncate() -> None:
+                (connection, _) = server.accept()
+                with connection:
+                    connection.sendall(b"{\"returncode\"")
+
+            thread = threading.Thread(target=accept_and_truncate,
+                                      daemon=True)
+            thread.start()
+
+            with unittest.mock.patch("spawneditor.edit_file") as mock_edit:
+                spawneditor_daemon.edit_file_via_daemon(
+                    "some_file.txt",
+                    line_number=42,
+                    socket_path=socket_path)
+                mock_edit.assert_called_once_with("some_file.txt",
+                                                  line_number=42,
+                                                  editor=None)
+            thread.join()
+
+
+def test_daemon_fallback_without_runtime_directory(
+        monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests the in-process fallback when no socket path is available because
+    `XDG_RUNTIME_DIR` is not set.
+    """
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    with unittest.mock.patch("spawneditor.edit_file") as mock_edit:
+        spawneditor_daemon.edit_file_via_daemon("some_file.txt",
+                                                line_number=42)
+        mock_edit.assert_called_once_with("some_file.txt",
+                                          line_number=42,
+                                          editor=None)
+
+
+def test_serve_requires_socket_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that `serve` refuses to run without a usable socket path."""
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    with pytest.raises(ValueError):
+        spawneditor_daemon.serve()